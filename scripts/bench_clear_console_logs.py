@@ -0,0 +1,128 @@
+"""Benchmark harness for clear_console_logs.py.
+
+Generates a synthetic TypeScript tree and times the walk, read, hash, match
+and write phases of a check pass and a rewrite pass over it.
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import clear_console_logs
+
+PLAIN_LINES = [
+    'import {{ useState }} from "react";',
+    'const value{n} = compute({n}, "label {n}");',
+    'export function helper{n}(input: string): string {{',
+    '  return input.replace(/[a-z]+\\/(\\d+)/g, "$1");',
+    '}}',
+    '// TODO: tidy up helper{n} (see console output)',
+    'const message{n} = `value is ${{value{n} + 1}}`;',
+    'if (count > {n}) {{ total = total / {n}; }}',
+    '/* block comment mentioning console.log({n}) */',
+    '  const items = list.map((item) => ({{ id: item.id, name: item.name }}));',
+]
+
+MATCH_LINES = [
+    '  console.log("value", value{n});',
+    '  console.log(`nested ${{format({{ a: "(" }})}}`, {n});',
+    '  console.log(\n    "multi-line call {n}",\n    {{ value: value{n} }},\n  );',
+]
+
+
+def generate_file(rng, lines, density, multiline):
+    out = []
+    for n in range(lines):
+        if rng.random() < density:
+            template = MATCH_LINES[2] if rng.random() < multiline else rng.choice(MATCH_LINES[:2])
+        else:
+            template = rng.choice(PLAIN_LINES)
+        out.append(template.format(n=n))
+    return '\n'.join(out) + '\n'
+
+
+def generate_long_line_file(length):
+    # One huge line of statements with many brackets, strings and regexes, as
+    # bundlers produce, with a console.log statement in every unit
+    unit = 'a(b[c]({d:"x)"}));r=/re(/g;console.log(r);'
+    return unit * max(1, length // len(unit)) + '\n'
+
+
+def generate_tree(root, files, lines, density, multiline, long_line, seed):
+    """Write a synthetic tree under ``root`` and return its size in bytes."""
+    rng = random.Random(seed)
+    total = 0
+    for index in range(files):
+        directory = os.path.join(root, f'module{index % 32}', f'part{index % 7}')
+        os.makedirs(directory, exist_ok=True)
+        suffix = '.tsx' if index % 3 == 0 else '.ts'
+        content = generate_file(rng, lines, density if rng.random() < 0.5 else 0, multiline)
+        with open(os.path.join(directory, f'file{index}{suffix}'), 'w') as file:
+            total += file.write(content)
+    if long_line:
+        with open(os.path.join(root, 'bundle.generated.ts'), 'w') as file:
+            total += file.write(generate_long_line_file(long_line))
+    return total
+
+
+def run_pass(name, worker, directory, jobs):
+    timer = clear_console_logs.PhaseTimer()
+    start = time.perf_counter()
+    _, processed = clear_console_logs.process_paths(
+        worker, [directory], jobs=jobs, timer=timer, use_gitignore=False)
+    wall = time.perf_counter() - start
+    print(f'\n== {name} ({len(processed)} files, jobs={jobs}) ==')
+    print(timer.format(wall))
+    return wall
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark clear_console_logs.py on a synthetic tree.')
+    parser.add_argument('--files', type=int, default=600, help='number of files (default: 600)')
+    parser.add_argument('--lines', type=int, default=200, help='lines per file (default: 200)')
+    parser.add_argument('--density', type=float, default=0.02,
+                        help='fraction of lines that are console.log calls, in half of the files '
+                             '(default: 0.02)')
+    parser.add_argument('--multiline', type=float, default=0.3,
+                        help='fraction of console.log calls spanning several lines (default: 0.3)')
+    parser.add_argument('--long-line', type=int, default=0, metavar='BYTES',
+                        help='also generate one file with a single line of this many bytes')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='worker processes (default: 1)')
+    parser.add_argument('--repeat', type=int, default=3, help='passes per mode (default: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: 0)')
+    parser.add_argument('--keep', action='store_true', help='keep the generated tree')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix='clear-console-logs-bench-')
+    try:
+        template = os.path.join(workdir, 'template')
+        size = generate_tree(template, args.files, args.lines, args.density, args.multiline,
+                             args.long_line, args.seed)
+        print(f'Generated {args.files} files ({size / 1e6:.1f} MB) in {template}')
+
+        for attempt in range(args.repeat):
+            run_pass(f'check #{attempt + 1}', clear_console_logs.find_console_logs_in_file,
+                     template, args.jobs)
+        for attempt in range(args.repeat):
+            # Rewriting changes the tree, so every pass gets a fresh copy
+            tree = os.path.join(workdir, f'rewrite{attempt}')
+            shutil.copytree(template, tree)
+            run_pass(f'rewrite #{attempt + 1}', clear_console_logs.remove_console_logs_from_file,
+                     tree, args.jobs)
+            shutil.rmtree(tree)
+    finally:
+        if args.keep:
+            print(f'\nKept {workdir}')
+        else:
+            shutil.rmtree(workdir)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
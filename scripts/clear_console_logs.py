@@ -1,30 +1,1120 @@
+"""Strip console.log (and other logging) call statements from TS/JS sources.
+
+Usable as a script (see parse_args) or as a library:
+
+    strip(text)          -> (stripped_text, [(line, column, call), ...])
+    strip_paths(paths)   -> [(file_path, removed_count), ...]
+"""
+import argparse
+import contextlib
+import errno
+import hashlib
+import json
+import mmap
 import re
 import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import repeat
+
+DEFAULT_TARGETS = ('console.log',)
+DEFAULT_EXTENSIONS = ('.ts', '.tsx')
+
+# Tokens the scanner has to stop at besides the call targets: comments,
+# string/template/regex delimiters and brackets. Everything else is skipped
+# by the regex engine without a Python-level step per byte.
+CODE_TOKEN_PATTERN = rb'//|/\*|[\'"`/()\[\]{}]'
+STRING_STOP = {
+    ord("'"): re.compile(rb"[\\'\n]"),
+    ord('"'): re.compile(rb'[\\"\n]'),
+}
+TEMPLATE_STOP = re.compile(rb'[\\`]|\$\{')
+REGEX_STOP = re.compile(rb'[\\/\[\]\n]')
+CALL_OPEN = re.compile(rb'[ \t]*\(')
+# Whitespace and comments between a call's `)` and whatever follows it.
+CALL_TRAILER = re.compile(rb'(?:\s|//[^\n]*|/\*.*?\*/)*', re.DOTALL)
+# A line starting with one of these continues the expression on the line
+# before (no semicolon is inserted), e.g. `.then(f)`, `|| x` or `[0] = 1`.
+# `++` and `--` are the exception: they start a new statement.
+CONTINUATION = re.compile(rb'(?!\+\+|--)(?:[.\[(?,`*/%&|^<>=+-]|!=|in(?:stanceof)?(?![\w$]))')
+LINE_REST = re.compile(rb'[ \t]*(?:\r?\n|\Z)')
+
+WHITESPACE = b' \t\r\n'
+IDENTIFIER_BYTES = frozenset(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$')
+# A `/` after one of these keywords starts a regex literal, not a division.
+REGEX_KEYWORDS = frozenset([
+    b'return', b'typeof', b'instanceof', b'in', b'of', b'new', b'delete', b'void',
+    b'throw', b'case', b'do', b'else', b'yield', b'await',
+])
+# A call is only removed when it is a statement of its own, i.e. it follows
+# one of these (or starts the file) and is followed by `;`, `}`, the end of
+# the file or a line break that ends the statement. `x && console.log(...)`,
+# `() => console.log(...)` or `console.log(...).then(f)` are left alone since
+# removing them breaks the code.
+STATEMENT_BOUNDARY = frozenset(b';{}')
+# Statements cannot appear directly inside these, so a boundary byte there
+# (the `;` in `for (a; b; c)`, the `{` of `${`) does not start one. `={`
+# stands for a `{` after `=`: a JSX attribute expression such as
+# `onClick={...}`, or an object literal.
+EXPRESSION_BRACKETS = frozenset([b'(', b'[', b'${', b'={'])
+
+# token_pattern finds scanner tokens and every call target in one search;
+# prefixes are literal substrings at least one of which a file must contain
+# to have any match at all.
+Matcher = namedtuple('Matcher', ['targets', 'token_pattern', 'prefixes'])
+
+
+def compile_targets(targets):
+    """Compile call targets such as ``console.log`` or ``logger.*`` into a Matcher.
+
+    Each target is a dotted name; a ``*`` segment matches any single
+    property name. Targets sharing an object are grouped, so
+    ``console.log`` and ``console.debug`` become ``console\\.(?:debug|log)``.
+    """
+    targets = tuple(sorted(set(targets)))
+    if not targets:
+        raise ValueError('at least one call target is required')
+    grouped = {}
+    prefixes = set()
+    for target in targets:
+        parts = target.split('.')
+        if not all(re.fullmatch(r'[A-Za-z_$][\w$]*|\*', part) for part in parts) or parts[0] == '*':
+            raise ValueError(f'invalid call target: {target!r}')
+        head, *rest = parts
+        tail = '.'.join(rest)
+        grouped.setdefault(head, set()).add(tail)
+        literal = target.split('*', 1)[0]
+        prefixes.add(literal.encode())
+
+    def segment(part):
+        return r'[\w$]+' if part == '*' else re.escape(part)
+
+    def tail_order(tail):
+        # The regex takes the first alternative that matches, so longer
+        # tails must come before their prefixes and literal segments before
+        # `*`: otherwise `a.*` would match the `a.b` of `a.b.c(...)`.
+        parts = tail.split('.')
+        return -len(parts), [part == '*' for part in parts], tail
+
+    alternatives = []
+    for head, tails in sorted(grouped.items()):
+        rest = [r'\.'.join(segment(part) for part in tail.split('.'))
+                for tail in sorted((tail for tail in tails if tail), key=tail_order)]
+        pattern = re.escape(head)
+        if rest and '' in tails:
+            pattern += r'(?:\.(?:' + '|'.join(rest) + '))?'
+        elif rest:
+            pattern += r'\.(?:' + '|'.join(rest) + ')'
+        alternatives.append(pattern)
+    call_pattern = r'(?<![\w$.])(?:' + '|'.join(alternatives) + r')(?![\w$])'
+    token_pattern = re.compile(CODE_TOKEN_PATTERN + b'|' + call_pattern.encode())
+    # A prefix that contains another one is redundant for the prefilter.
+    prefixes = tuple(sorted(p for p in prefixes if not any(o != p and o in p for o in prefixes)))
+    return Matcher(targets, token_pattern, prefixes)
+
+
+DEFAULT_MATCHER = compile_targets(DEFAULT_TARGETS)
+
+
+@lru_cache(maxsize=32)
+def _cached_matcher(targets):
+    return compile_targets(targets)
+
+
+def get_matcher(targets=DEFAULT_TARGETS):
+    """Return the compiled Matcher for ``targets``, reusing earlier compilations."""
+    return _cached_matcher(tuple(sorted(set(targets))))
+
+
+def might_match(data, matcher):
+    # Cheap substring check that rules out most files before scanning.
+    return any(data.find(prefix) >= 0 for prefix in matcher.prefixes)
+
+
+class ConsoleLogScanner:
+    """Single-pass scanner that finds call statements such as console.log(...).
+
+    Understands comments, string and template literals (including nested
+    ``${...}`` expressions), regex literals and balanced brackets, so calls
+    spanning several lines are found in full and look-alikes inside strings
+    or comments are ignored. Runs in time linear in the input size.
+    """
+
+    def __init__(self, data, matcher=DEFAULT_MATCHER):
+        self.data = data
+        self.token_pattern = matcher.token_pattern
+        # spans are the byte ranges to remove; matches are the
+        # (start, name_end, end) of each call statement. They differ when a
+        # span is widened to its line or covers two statements.
+        self.spans = []
+        self.matches = []
+        # Maps the end offset of every comment to its start, so looking back
+        # for the previous significant byte can step over comments.
+        self.comments = {}
+        # (end, line_start) of the last span when only whitespace and other
+        # spans precede it on its line.
+        self._line_prefix = None
+
+    def scan(self):
+        self._scan_code(0, stop_at_close=False, opener=None)
+        return self.spans
+
+    def _scan_code(self, pos, stop_at_close, opener):
+        # Returns the offset of the unmatched closing bracket when
+        # stop_at_close is set, or len(data) when the input runs out.
+        # opener is the bracket this code sits in (b'${' for a template
+        # expression), or None at the top level.
+        data = self.data
+        token_pattern = self.token_pattern
+        brackets = []
+        while True:
+            match = token_pattern.search(data, pos)
+            if match is None:
+                return len(data)
+            start = match.start()
+            token = match.group()
+            first = data[start]
+            if token == b'//':
+                end = data.find(b'\n', start)
+                pos = len(data) if end < 0 else end
+                self.comments[pos] = start
+            elif token == b'/*':
+                end = data.find(b'*/', start + 2)
+                pos = len(data) if end < 0 else end + 2
+                self.comments[pos] = start
+            elif first in STRING_STOP:
+                pos = self._skip_string(start + 1, STRING_STOP[first])
+            elif token == b'`':
+                pos = self._skip_template(start + 1)
+            elif token == b'/':
+                pos = self._skip_regex(start + 1) if self._starts_regex(start) else start + 1
+            elif token in (b'(', b'['):
+                brackets.append(token)
+                pos = start + 1
+            elif token == b'{':
+                previous = self._previous_significant(start)
+                brackets.append(b'={' if previous >= 0 and data[previous] == 0x3D else token)
+                pos = start + 1
+            elif token in (b')', b']', b'}'):
+                if not brackets and stop_at_close:
+                    return start
+                if brackets:
+                    brackets.pop()
+                pos = start + 1
+            else:
+                innermost = brackets[-1] if brackets else opener
+                pos = self._handle_call(start, match.end(), innermost)
+
+    def _skip_string(self, pos, stop):
+        data = self.data
+        while True:
+            match = stop.search(data, pos)
+            if match is None:
+                return len(data)
+            if data[match.start()] == 0x5C:  # backslash
+                pos = match.start() + 2
+            elif data[match.start()] == 0x0A:
+                # Unterminated string, e.g. an apostrophe in JSX text.
+                # Recover at the end of the line.
+                return match.start()
+            else:
+                return match.end()
+
+    def _skip_template(self, pos):
+        data = self.data
+        while True:
+            match = TEMPLATE_STOP.search(data, pos)
+            if match is None:
+                return len(data)
+            token = match.group()
+            if token == b'\\':
+                pos = match.start() + 2
+            elif token == b'`':
+                return match.end()
+            else:
+                pos = self._scan_code(match.end(), stop_at_close=True, opener=b'${') + 1
+
+    def _skip_regex(self, pos):
+        data = self.data
+        in_class = False
+        while True:
+            match = REGEX_STOP.search(data, pos)
+            if match is None:
+                return len(data)
+            token = match.group()
+            if token == b'\\':
+                pos = match.start() + 2
+                continue
+            pos = match.end()
+            if token == b'\n':
+                return match.start()
+            if token == b'[':
+                in_class = True
+            elif token == b']':
+                in_class = False
+            elif not in_class:
+                return pos
+
+    def _previous_significant(self, pos):
+        # Index of the last byte before pos that is neither whitespace nor
+        # part of a comment, or -1.
+        data = self.data
+        i = pos - 1
+        while i >= 0:
+            if data[i] in WHITESPACE:
+                i -= 1
+            elif i + 1 in self.comments:
+                i = self.comments[i + 1] - 1
+            else:
+                break
+        return i
+
+    def _starts_regex(self, pos):
+        data = self.data
+        i = self._previous_significant(pos)
+        if i < 0:
+            return True
+        if data[i] in IDENTIFIER_BYTES:
+            start = i
+            while start > 0 and data[start - 1] in IDENTIFIER_BYTES:
+                start -= 1
+            return data[start:i + 1] in REGEX_KEYWORDS
+        return data[i] not in b')]'
+
+    def _handle_call(self, start, name_end, innermost):
+        data = self.data
+        call = CALL_OPEN.match(data, name_end)
+        if call is None:
+            return name_end
+        nested_spans = len(self.spans)
+        nested_matches = len(self.matches)
+        close = self._scan_code(call.end(), stop_at_close=True, opener=b'(')
+        # Anything found inside the arguments goes away with the outer call.
+        del self.spans[nested_spans:]
+        del self.matches[nested_matches:]
+        if close >= len(data):
+            return close
+        if innermost in EXPRESSION_BRACKETS:
+            return close + 1
+        previous = self._previous_significant(start)
+        if previous >= 0 and data[previous] not in STATEMENT_BOUNDARY:
+            return close + 1
+        following = CALL_TRAILER.match(data, close + 1).end()
+        if following < len(data) and data[following] == 0x3B:  # ;
+            end = following + 1
+        elif (following < len(data) and data[following] != 0x7D  # }
+                and (data.find(b'\n', close + 1, following) < 0
+                     or CONTINUATION.match(data, following))):
+            # Something on the same line, or a continuation on the next one,
+            # still uses the call's value.
+            return close + 1
+        else:
+            end = close + 1
+        self.matches.append((start, name_end, end))
+        self._add_span(start, end)
+        return end
+
+    def _add_span(self, start, end):
+        # Drop the whole line when the statement (or a run of statements) is
+        # the only thing on it. Only the whitespace around the statement is
+        # looked at, so long single-line files stay linear.
+        data = self.data
+        line_start = start
+        while line_start > 0 and data[line_start - 1] in b' \t':
+            line_start -= 1
+        if line_start > 0 and data[line_start - 1] != 0x0A:
+            prefix = self._line_prefix
+            # Directly follows earlier statements that began the line?
+            line_start = prefix[1] if prefix is not None and prefix[0] == line_start else None
+        if line_start is None:
+            self.spans.append((start, end))
+            self._line_prefix = None
+            return
+        rest = LINE_REST.match(data, end)
+        if rest is None:
+            self.spans.append((start, end))
+            self._line_prefix = (end, line_start)
+            return
+        while self.spans and self.spans[-1][0] >= line_start:
+            self.spans.pop()
+        self.spans.append((line_start, rest.end()))
+        self._line_prefix = None
+
+
+def kept_ranges(size, spans):
+    """Yield the ``(start, end)`` ranges of a buffer that lie outside ``spans``."""
+    pos = 0
+    for start, end in spans:
+        if start > pos:
+            yield pos, start
+        pos = end
+    if pos < size:
+        yield pos, size
+
+
+def kept_slices(data, spans):
+    """Yield zero-copy views of the parts of ``data`` outside ``spans``.
+
+    Each view is released as soon as the next one is requested, so the
+    generator must be consumed (or closed) before ``data`` is closed.
+    """
+    with memoryview(data) as view:
+        for start, end in kept_ranges(len(data), spans):
+            with view[start:end] as piece:
+                yield piece
+
+
+def locate_matches(data, matches):
+    """Return ``(line, column, call)`` for each scanner match, 1-based.
+
+    Columns count code points rather than bytes, as editors and SARIF do.
+    """
+    locations = []
+    line = 1
+    column = 0
+    pos = 0
+    for start, name_end, _ in matches:
+        # Slicing also works for mmap buffers, which have no count(). The
+        # segments between matches are disjoint, so line and column are
+        # advanced incrementally and each byte is decoded once. Matches
+        # start with an ASCII name, so segments never split a character.
+        segment = data[pos:start]
+        newlines = segment.count(b'\n')
+        if newlines:
+            line += newlines
+            segment = segment[segment.rfind(b'\n') + 1:]
+            column = 0
+        column += len(segment.decode('utf-8', 'replace'))
+        pos = start
+        locations.append((line, column + 1, data[start:name_end].decode()))
+    return locations
+
+
+def strip(text, targets=DEFAULT_TARGETS):
+    """Remove call statements from an in-memory buffer.
+
+    ``text`` may be ``str`` or ``bytes``; the result has the same type.
+    Returns ``(stripped, matches)`` where matches are the ``(line, column,
+    call)`` of each removed statement in the original text.
+    """
+    data = text.encode('utf-8') if isinstance(text, str) else text
+    matcher = get_matcher(targets)
+    if not might_match(data, matcher):
+        return text, []
+    scanner = ConsoleLogScanner(data, matcher)
+    spans = scanner.scan()
+    if not spans:
+        return text, []
+    stripped = b''.join(data[start:end] for start, end in kept_ranges(len(data), spans))
+    if isinstance(text, str):
+        stripped = stripped.decode('utf-8')
+    return stripped, locate_matches(data, scanner.matches)
+
+
+DEFAULT_CACHE_PATH = '.clear_console_logs_cache.json'
+# Bump when the cache layout or the matching rules change, so entries recorded
+# by an older engine are never trusted.
+CACHE_VERSION = 3
+
+# Files at least this large are memory-mapped instead of read into memory.
+MMAP_THRESHOLD = 1024 * 1024
+# Windows cannot rename a file over one that is still mapped, so there the
+# rewritten content is built in memory and the mapping released first.
+REPLACE_NEEDS_UNMAPPED = os.name == 'nt'
+
+
+def write_file_atomically(file_path, chunks):
+    # Write to a temp file next to the target and rename it over the original,
+    # so readers never see a half-written file. Symlinks are resolved first so
+    # the link target is replaced, not the link itself.
+    file_path = os.path.realpath(file_path)
+    if os.stat(file_path).st_nlink > 1:
+        # A rename would detach this name from its other hard links, so
+        # overwrite in place instead. The chunks may be views of a mapping of
+        # this very file, so they are copied out before it is truncated.
+        data = b''.join(bytes(chunk) for chunk in chunks)
+        with open(file_path, 'wb') as file:
+            file.write(data)
+        return
+    directory = os.path.dirname(file_path)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            for chunk in chunks:
+                file.write(chunk)
+        shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+@contextlib.contextmanager
+def open_source_buffer(file_path):
+    # Large files are mapped rather than read, so a pool of workers does not
+    # hold a full copy (plus a modified copy) of each one in memory. The file
+    # itself is closed straight away; a mapping outlives its file handle.
+    with open(file_path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            content = file.read()
+        else:
+            content = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if isinstance(content, bytes):
+        yield content
+        return
+    with content:
+        yield content
+
+
+PHASES = ('walk', 'cache', 'read', 'hash', 'match', 'write')
+
+
+class PhaseTimer:
+    """Accumulates wall time per phase plus bytes read and written.
+
+    Worker processes fill their own timer, which is merged into the parent's.
+    """
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+
+    def merge(self, other):
+        for name, seconds in other.seconds.items():
+            self.seconds[name] += seconds
+        self.bytes_read += other.bytes_read
+        self.bytes_written += other.bytes_written
+
+    def format(self, wall_seconds):
+        def rate(seconds):
+            if not seconds:
+                return ''
+            return f'  {self.bytes_read / seconds / 1e6:9.1f} MB/s'
+
+        lines = [f'{"phase":<8}{"seconds":>10}']
+        for name in PHASES:
+            seconds = self.seconds[name]
+            # Throughput only means something for phases that touch every byte
+            throughput = rate(seconds) if name in ('read', 'hash', 'match') else ''
+            lines.append(f'{name:<8}{seconds:10.4f}{throughput}')
+        lines.append(f'{"total":<8}{wall_seconds:10.4f}{rate(wall_seconds)}')
+        lines.append(f'read {self.bytes_read} bytes, wrote {self.bytes_written} bytes '
+                     '(phase times are summed over worker processes)')
+        return '\n'.join(lines)
+
+
+def scan_buffer(content, matcher, timer, clean_digest=None, want_digest=False):
+    """Scan a file's content, skipping the work the prefilter or cache rules out.
+
+    Returns ``(scanner, clean, digest)``. ``scanner`` is None when no scan was
+    needed. ``digest`` is only computed when ``want_digest`` (i.e. a cache) is
+    in use and the file passed the prefilter, since a cheap prefilter is
+    enough to re-check every other file.
+    """
+    with timer.phase('match'):
+        # Most files have no call targets at all; skip them without hashing
+        if not might_match(content, matcher):
+            return None, True, None
+    digest = None
+    if want_digest:
+        with timer.phase('hash'):
+            digest = hashlib.sha256(content).hexdigest()
+        if digest == clean_digest:
+            return None, True, digest
+    with timer.phase('match'):
+        scanner = ConsoleLogScanner(content, matcher)
+        scanner.scan()
+    if scanner.matches:
+        return scanner, False, None
+    return scanner, True, digest
+
+
+def remove_console_logs_from_file(file_path, clean_digest=None, matcher=DEFAULT_MATCHER, timer=None,
+                                  want_digest=False):
+    """Strip console.log (or other ``matcher`` target) statements from a file.
+
+    Returns ``(removed, clean, digest)``. ``clean`` tells the caller it may
+    cache the file as having nothing to remove; ``digest`` is its content
+    hash when ``want_digest`` is set and the prefilter alone could not tell.
+    If the content hashes to ``clean_digest`` matching is skipped.
+    """
+    timer = timer or PhaseTimer()
+    with contextlib.ExitStack() as stack:
+        with timer.phase('read'):
+            content = stack.enter_context(open_source_buffer(file_path))
+        timer.bytes_read += len(content)
+        scanner, clean, digest = scan_buffer(content, matcher, timer, clean_digest, want_digest)
+        if clean:
+            return 0, True, digest
+
+        spans = scanner.spans
+        timer.bytes_written += len(content) - sum(end - start for start, end in spans)
+        with timer.phase('write'):
+            if isinstance(content, mmap.mmap) and REPLACE_NEEDS_UNMAPPED:
+                with contextlib.closing(kept_slices(content, spans)) as chunks:
+                    output = b''.join(bytes(chunk) for chunk in chunks)
+                stack.close()
+                write_file_atomically(file_path, [output])
+            else:
+                # Stream the untouched parts straight from the buffer into the new file
+                with contextlib.closing(kept_slices(content, spans)) as chunks:
+                    write_file_atomically(file_path, chunks)
+        return len(scanner.matches), False, None
+
+
+def find_console_logs_in_file(file_path, clean_digest=None, matcher=DEFAULT_MATCHER, timer=None,
+                              want_digest=False):
+    """Like remove_console_logs_from_file, but only report matches.
+
+    Returns ``(locations, clean, digest)`` where locations are ``(line,
+    column, call)`` tuples; the file is never modified.
+    """
+    timer = timer or PhaseTimer()
+    with contextlib.ExitStack() as stack:
+        with timer.phase('read'):
+            content = stack.enter_context(open_source_buffer(file_path))
+        timer.bytes_read += len(content)
+        scanner, clean, digest = scan_buffer(content, matcher, timer, clean_digest, want_digest)
+        if clean:
+            return [], True, digest
+        with timer.phase('match'):
+            return locate_matches(content, scanner.matches), False, None
+
+
+def run_timed(worker, file_path, clean_digest, matcher):
+    # Pool entry point when profiling: the worker's timer travels back with
+    # its result.
+    timer = PhaseTimer()
+    return worker(file_path, clean_digest, matcher, timer), timer
+
+
+def translate_ignore_pattern(pattern):
+    """Translate a gitignore glob into a regex matched against a '/'-separated path."""
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        at_segment_start = i == 0 or pattern[i - 1] == '/'
+        if pattern.startswith('**/', i) and at_segment_start:
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i) and at_segment_start and i + 2 == n:
+            out.append('.*')
+            i += 2
+        elif c == '*':
+            out.append('[^/]*')
+            i += 1
+        elif c == '?':
+            out.append('[^/]')
+            i += 1
+        elif c == '[' and pattern.find(']', i + 2) > 0:
+            end = pattern.find(']', i + 2)
+            body = pattern[i + 1:end].replace('\\', '\\\\')
+            if body[0] in '!^':
+                body = '^' + body[1:]
+            out.append(f'[{body}]')
+            i = end + 1
+        elif c == '\\' and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return ''.join(out)
+
+
+IgnoreRule = namedtuple('IgnoreRule', ['regex', 'negate', 'dir_only'])
+
+
+class IgnoreRules:
+    """The rules of one .gitignore file (or a list of exclude globs).
+
+    Paths handed to ``match`` are relative to the walk root and '/'-separated.
+    ``strip`` is the root-relative directory the rules live in, and ``prepend``
+    is the walk root relative to that directory when the rules live above it.
+    """
+
+    def __init__(self, patterns, strip='', prepend=''):
+        self.strip = strip
+        self.prepend = prepend
+        self.rules = []
+        for line in patterns:
+            line = line.rstrip('\n').rstrip('\r')
+            if not line.endswith('\\ '):
+                line = line.rstrip(' ')
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+            # A slash anywhere but the end anchors the pattern to its directory
+            anchored = '/' in line
+            regex = translate_ignore_pattern(line.lstrip('/'))
+            if not anchored:
+                regex = '(?:.*/)?' + regex
+            self.rules.append(IgnoreRule(re.compile(regex, re.DOTALL), negate, dir_only))
+
+    @classmethod
+    def from_file(cls, path, strip='', prepend=''):
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as file:
+                rules = cls(file, strip, prepend)
+        except OSError:
+            return None
+        return rules if rules.rules else None
+
+    def match(self, rel_path, is_dir):
+        """Return True (ignored), False (re-included by ``!``) or None (no rule matched)."""
+        path = self.prepend + rel_path[len(self.strip):]
+        result = None
+        for rule in self.rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.fullmatch(path):
+                result = not rule.negate
+        return result
+
+
+def is_ignored(rule_sets, rel_path, is_dir):
+    # Rule sets are ordered by increasing precedence; the last match wins.
+    for rules in reversed(rule_sets):
+        result = rules.match(rel_path, is_dir)
+        if result is not None:
+            return result
+    return False
+
+
+def parent_gitignore_rules(directory):
+    # .gitignore files between the enclosing repository root and directory
+    # also apply to files below directory.
+    directory = os.path.abspath(directory)
+    rule_sets = []
+    current = os.path.dirname(directory)
+    if os.path.exists(os.path.join(directory, '.git')):
+        return rule_sets
+    while True:
+        prefix = os.path.relpath(directory, current).replace(os.sep, '/') + '/'
+        rules = IgnoreRules.from_file(os.path.join(current, '.gitignore'), prepend=prefix)
+        if rules:
+            rule_sets.append(rules)
+        if os.path.exists(os.path.join(current, '.git')):
+            break
+        parent = os.path.dirname(current)
+        if parent == current:
+            # Not inside a repository, so the parent files do not apply.
+            return []
+        current = parent
+    rule_sets.reverse()
+    return rule_sets
+
+
+DEFAULT_EXCLUDES = ('*.spec.*', '*.test.*')
+
+
+def find_source_files(directory, extensions=DEFAULT_EXTENSIONS, excludes=DEFAULT_EXCLUDES,
+                      use_gitignore=True):
+    """Yield source files under ``directory``, honouring .gitignore and ``excludes``.
+
+    ``excludes`` are gitignore-style globs relative to ``directory``. Ignored
+    directories are pruned before they are descended into.
+    """
+    base_rules = parent_gitignore_rules(directory) if use_gitignore else []
+    exclude_rules = IgnoreRules(excludes)
+    stack = [(directory, '', base_rules)]
+    while stack:
+        dir_path, rel_dir, rule_sets = stack.pop()
+        if use_gitignore:
+            rules = IgnoreRules.from_file(os.path.join(dir_path, '.gitignore'), strip=rel_dir)
+            if rules:
+                rule_sets = rule_sets + [rules]
+        active = rule_sets + [exclude_rules]
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            rel_path = rel_dir + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name != '.git' and not is_ignored(active, rel_path, True):
+                    subdirs.append((entry.path, rel_path + '/', rule_sets))
+            elif entry.name.endswith(extensions) and entry.is_file():
+                if not is_ignored(active, rel_path, False):
+                    yield entry.path
+        # Reversed so directories are visited in name order
+        stack.extend(reversed(subdirs))
+
+
+def find_changed_source_files(directory, rev, extensions=DEFAULT_EXTENSIONS, excludes=DEFAULT_EXCLUDES):
+    """List source files under ``directory`` that differ from git revision ``rev``.
+
+    Covers committed, staged and unstaged changes as well as untracked files.
+    Git already applies .gitignore to untracked files; ``excludes`` are
+    applied to the result.
+    """
+    def git(*args):
+        return subprocess.run(['git', *args], cwd=directory, check=True,
+                              capture_output=True, text=True).stdout
+
+    toplevel = git('rev-parse', '--show-toplevel').strip()
+    changed = git('diff', '--name-only', '-z', '--diff-filter=d', rev, '--', '.').split('\0')
+    untracked = git('ls-files', '--full-name', '--others', '--exclude-standard', '-z', '--', '.').split('\0')
+
+    exclude_rules = [IgnoreRules(excludes)]
+    file_paths = set()
+    for name in changed + untracked:
+        if not name.endswith(extensions):
+            continue
+        path = os.path.join(toplevel, name)
+        parts = os.path.relpath(path, directory).replace(os.sep, '/').split('/')
+        # A file is excluded when it or any of its parent directories matches an exclude glob
+        ancestors = ('/'.join(parts[:i]) for i in range(1, len(parts)))
+        if any(is_ignored(exclude_rules, ancestor, True) for ancestor in ancestors):
+            continue
+        if not is_ignored(exclude_rules, '/'.join(parts), False):
+            file_paths.add(os.path.relpath(path))
+    return sorted(file_paths)
+
+
+def load_cache(cache_path, matcher):
+    try:
+        with open(cache_path, 'r') as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    # A file that is clean for one set of targets may not be for another.
+    if (not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION
+            or cache.get('targets') != list(matcher.targets)):
+        return {}
+    return cache.get('files', {})
+
+
+def save_cache(cache_path, files, matcher):
+    cache = {
+        'version': CACHE_VERSION,
+        'targets': list(matcher.targets),
+        'files': files,
+    }
+    # A torn write is harmless: load_cache treats an unreadable cache as empty.
+    with open(cache_path, 'w') as file:
+        json.dump(cache, file, separators=(',', ':'), sort_keys=True)
+
+
+def collect_source_files(paths, extensions=DEFAULT_EXTENSIONS, excludes=DEFAULT_EXCLUDES,
+                         use_gitignore=True, since=None):
+    """Expand files and directories into a de-duplicated list of source files.
+
+    Directories are walked (or, with ``since``, asked git for changed files);
+    files named explicitly are always included, whatever their extension.
+    """
+    file_paths = []
+    seen = set()
+    for path in paths:
+        if not os.path.exists(path):
+            raise FileNotFoundError(errno.ENOENT, 'No such file or directory', path)
+        if not os.path.isdir(path):
+            found = [path]
+        elif since is not None:
+            found = find_changed_source_files(path, since, extensions, excludes)
+        else:
+            found = find_source_files(path, extensions, excludes, use_gitignore)
+        for file_path in found:
+            key = os.path.abspath(file_path)
+            if key not in seen:
+                seen.add(key)
+                file_paths.append(file_path)
+    return file_paths
+
+
+def process_paths(worker, paths, jobs=1, cache_path=None, since=None,
+                  targets=DEFAULT_TARGETS, extensions=DEFAULT_EXTENSIONS,
+                  excludes=DEFAULT_EXCLUDES, use_gitignore=True, timer=None):
+    """Run ``worker`` over the source files in ``paths`` (files or directories).
+
+    ``worker(file_path, clean_digest, matcher, timer, want_digest)`` must
+    return ``(result, clean, digest)`` as remove_console_logs_from_file
+    does. Returns the number of files considered and a list of
+    ``(file_path, result)`` for the files that were not skipped via the
+    cache. Pass a PhaseTimer as ``timer`` to collect per-phase timings.
+    """
+    # All targets are compiled into one matcher so each file is scanned once
+    matcher = get_matcher(targets)
+    profiling = timer is not None
+    timer = timer or PhaseTimer()
+    with timer.phase('walk'):
+        file_paths = collect_source_files(paths, tuple(extensions), excludes, use_gitignore, since)
+
+    # The cache maps absolute paths to [mtime_ns, size, sha256] of files known
+    # to be clean. A matching stat skips the file without reading it; a
+    # matching hash skips the matching step. The hash is null for files the
+    # substring prefilter already rules out, and is only computed at all when
+    # a cache is in use.
+    with timer.phase('cache'):
+        cache = load_cache(cache_path, matcher) if cache_path else {}
+        # A full walk sees every file, so entries for deleted files can be dropped.
+        new_cache = dict(cache) if since is not None else {}
+
+        pending = []
+        pending_stats = []
+        pending_digests = []
+        for file_path in file_paths:
+            key = os.path.abspath(file_path)
+            stat = os.stat(file_path)
+            entry = cache.get(key)
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                new_cache[key] = entry
+                continue
+            new_cache.pop(key, None)
+            pending.append(file_path)
+            pending_stats.append(stat)
+            pending_digests.append(entry[2] if entry else None)
+
+    worker = partial(worker, want_digest=bool(cache_path))
+    if jobs > 1 and len(pending) > 1:
+        # Each file is independent, so spread the work across processes.
+        # chunksize keeps the IPC overhead low for the many small files.
+        chunksize = max(1, len(pending) // (jobs * 4))
+        task = partial(run_timed, worker) if profiling else worker
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(task, pending, pending_digests,
+                                        repeat(matcher), chunksize=chunksize))
+        if profiling:
+            for _, worker_timer in results:
+                timer.merge(worker_timer)
+            results = [result for result, _ in results]
+    else:
+        results = [worker(path, digest, matcher, timer)
+                   for path, digest in zip(pending, pending_digests)]
+
+    processed = []
+    for file_path, stat, (result, clean, digest) in zip(pending, pending_stats, results):
+        if clean:
+            new_cache[os.path.abspath(file_path)] = [stat.st_mtime_ns, stat.st_size, digest]
+        processed.append((file_path, result))
+
+    if cache_path:
+        with timer.phase('cache'):
+            save_cache(cache_path, new_cache, matcher)
+
+    return len(file_paths), processed
+
+
+def strip_paths(paths, check=False, **options):
+    """Strip call statements from the source files in ``paths``.
+
+    Accepts the keyword options of process_paths. Returns ``(file_path,
+    removed)`` for every file that was read, or with ``check`` set,
+    ``(file_path, [(line, column, call), ...])`` without modifying anything.
+    Prints nothing.
+    """
+    worker = find_console_logs_in_file if check else remove_console_logs_from_file
+    _, processed = process_paths(worker, paths, **options)
+    return processed
+
+
+def remove_console_logs_from_paths(paths, **options):
+    """Strip matching statements from ``paths`` and print a summary.
+
+    Accepts the keyword options of process_paths and returns the number of
+    statements removed.
+    """
+    file_count, processed = process_paths(remove_console_logs_from_file, paths, **options)
+
+    files_changed = 0
+    total_removed = 0
+    for file_path, removed in processed:
+        if removed:
+            files_changed += 1
+            total_removed += removed
+            print(f"Removed {removed} statement(s) from {file_path}")
+
+    skipped = file_count - len(processed)
+    print(f"Processed {file_count} files ({skipped} skipped via cache): "
+          f"removed {total_removed} statement(s) from {files_changed} file(s)")
+    return total_removed
+
+
+def remove_console_logs_from_directory(directory, **options):
+    return remove_console_logs_from_paths([directory], **options)
+
+
+def find_console_logs_in_paths(paths, **options):
+    """Report matching statements in ``paths`` without modifying anything.
+
+    Accepts the keyword options of process_paths and returns a list of
+    ``(file_path, line, column, call)`` findings plus the number of files
+    checked.
+    """
+    file_count, processed = process_paths(find_console_logs_in_file, paths, **options)
+    findings = []
+    for file_path, locations in processed:
+        findings.extend((file_path, line, column, call) for line, column, call in locations)
+    return findings, file_count
+
+
+def to_uri(file_path):
+    return os.path.relpath(file_path).replace(os.sep, '/')
+
+
+def format_report(findings, report_format):
+    if report_format == 'json':
+        return json.dumps([
+            {'file': to_uri(file_path), 'line': line, 'column': column, 'call': call}
+            for file_path, line, column, call in findings
+        ], indent=2)
+    if report_format == 'sarif':
+        return json.dumps({
+            '$schema': 'https://json.schemastore.org/sarif-2.1.0.json',
+            'version': '2.1.0',
+            'runs': [{
+                'tool': {'driver': {
+                    'name': 'clear_console_logs',
+                    'rules': [{
+                        'id': 'logging-call',
+                        'shortDescription': {'text': 'Logging call left in source'},
+                    }],
+                }},
+                'columnKind': 'unicodeCodePoints',
+                'results': [{
+                    'ruleId': 'logging-call',
+                    'level': 'error',
+                    'message': {'text': f'{call} call should be removed'},
+                    'locations': [{'physicalLocation': {
+                        'artifactLocation': {'uri': to_uri(file_path)},
+                        'region': {'startLine': line, 'startColumn': column},
+                    }}],
+                } for file_path, line, column, call in findings],
+            }],
+        }, indent=2)
+    return '\n'.join(f'{file_path}:{line}:{column}: {call}' for file_path, line, column, call in findings)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Remove console.log (and other logging) statements from source files.')
+    parser.add_argument('paths', nargs='*', default=['src'], metavar='PATH',
+                        help='files or directories to process, or - to filter stdin to stdout '
+                             '(default: src)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of worker processes; 0 uses all available cores (default: 1)')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_PATH, metavar='PATH',
+                        help='remember files known to be clean and skip them on later runs '
+                             f'(default path: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--since', metavar='REV',
+                        help='only consider files changed since the given git revision')
+    parser.add_argument('-t', '--target', action='append', dest='targets', metavar='NAME',
+                        help='call to remove, e.g. console.debug or logger.*; may be repeated '
+                             f'(default: {", ".join(DEFAULT_TARGETS)})')
+    parser.add_argument('-e', '--ext', action='append', dest='extensions', metavar='EXT',
+                        help='file extension to process; may be repeated '
+                             f'(default: {" ".join(DEFAULT_EXTENSIONS)})')
+    parser.add_argument('-x', '--exclude', action='append', default=[], metavar='GLOB',
+                        help='gitignore-style glob, relative to each directory, of files or '
+                             'directories to skip; may be repeated')
+    parser.add_argument('--include-tests', action='store_true',
+                        help=f'also process test files (skipped by default: {" ".join(DEFAULT_EXCLUDES)})')
+    parser.add_argument('--no-gitignore', dest='use_gitignore', action='store_false',
+                        help='do not honour .gitignore files')
+    parser.add_argument('--check', action='store_true',
+                        help='modify nothing; report matches and exit with status 1 if there are any')
+    parser.add_argument('--report', choices=('text', 'json', 'sarif'), default='text',
+                        help='report format for --check (default: text)')
+    parser.add_argument('-o', '--output', metavar='PATH',
+                        help='write the --check report to PATH instead of stdout')
+    parser.add_argument('--profile', action='store_true',
+                        help='print per-phase timings and throughput to stderr')
+    args = parser.parse_args(argv)
+    if '-' in args.paths and len(args.paths) > 1:
+        parser.error('- (stdin) cannot be combined with other paths')
+    for path in args.paths:
+        if path != '-' and not os.path.exists(path):
+            parser.error(f'{path}: no such file or directory')
+    if args.jobs < 0:
+        parser.error('--jobs must be 0 or a positive integer')
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    args.targets = tuple(args.targets or DEFAULT_TARGETS)
+    try:
+        compile_targets(args.targets)
+    except ValueError as error:
+        parser.error(str(error))
+    args.extensions = tuple(ext if ext.startswith('.') else f'.{ext}'
+                            for ext in (args.extensions or DEFAULT_EXTENSIONS))
+    args.excludes = tuple(([] if args.include_tests else list(DEFAULT_EXCLUDES)) + args.exclude)
+    return args
 
-def remove_console_logs_from_file(file_path):
-    # Read the contents of the file
-    with open(file_path, 'r') as file:
-        content = file.read()
 
-    # Regular expression to match console.log statements
-    pattern = r'console\.log\(.*?\);?'
+def filter_stdin(args):
+    # Editor integrations pipe the buffer through; stdout only ever carries
+    # the (possibly unchanged) text, or the report with --check.
+    stripped, matches = strip(sys.stdin.buffer.read(), args.targets)
+    if not args.check:
+        sys.stdout.buffer.write(stripped)
+        return 0
+    report = format_report([('<stdin>', *match) for match in matches], args.report)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(report + '\n')
+    elif report:
+        print(report)
+    return 1 if matches else 0
 
-    # Remove all console.log statements
-    modified_content = re.sub(pattern, '', content)
 
-    # Write the modified content back to the file
-    with open(file_path, 'w') as file:
-        file.write(modified_content)
+def main(argv=None):
+    args = parse_args(argv)
+    if args.paths == ['-']:
+        return filter_stdin(args)
+    options = dict(jobs=args.jobs, cache_path=args.cache, since=args.since,
+                   targets=args.targets, extensions=args.extensions,
+                   excludes=args.excludes, use_gitignore=args.use_gitignore)
+    if args.profile:
+        options['timer'] = PhaseTimer()
+    start = time.perf_counter()
+    try:
+        if not args.check:
+            remove_console_logs_from_paths(args.paths, **options)
+        else:
+            findings, file_count = find_console_logs_in_paths(args.paths, **options)
+    except subprocess.CalledProcessError as error:
+        sys.exit(f"git failed: {error.stderr.strip()}")
+    if args.profile:
+        print(options['timer'].format(time.perf_counter() - start), file=sys.stderr)
+    if not args.check:
+        return 0
 
-    print(f"Removed all console.log statements from {file_path}")
+    report = format_report(findings, args.report)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(report + '\n')
+    elif report:
+        print(report)
+    files_with_findings = len({finding[0] for finding in findings})
+    # The summary goes to stderr so stdout stays machine-readable
+    print(f"Checked {file_count} files: found {len(findings)} statement(s) in "
+          f"{files_with_findings} file(s)", file=sys.stderr)
+    return 1 if findings else 0
 
-def remove_console_logs_from_directory(directory):
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith('.ts') or file.endswith(".tsx"):
-                file_path = os.path.join(root, file)
-                remove_console_logs_from_file(file_path)
 
 if __name__ == "__main__":
-    src_directory = 'src'  # Change this to the path of your src directory
-    remove_console_logs_from_directory(src_directory)
\ No newline at end of file
+    sys.exit(main())
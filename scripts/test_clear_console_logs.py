@@ -0,0 +1,414 @@
+import json
+import os
+import subprocess
+
+import pytest
+
+import clear_console_logs
+from clear_console_logs import strip
+
+
+def test_removes_multi_line_call():
+    source = (
+        "const handleApprove = async () => {\n"
+        "    console.log(\n"
+        "      `Approving proposal for chatId: ${chatId}, messageId: ${messageId}`,\n"
+        "    );\n"
+        "    setIsApproving(true);\n"
+        "};\n"
+    )
+    stripped, matches = strip(source)
+    assert stripped == "const handleApprove = async () => {\n    setIsApproving(true);\n};\n"
+    assert matches == [(2, 5, "console.log")]
+
+
+@pytest.mark.parametrize("source", [
+    'const s = "console.log(1);";\n',
+    "const s = 'console.log(\\'x\\');';\n",
+    "const t = `console.log(${a});`;\n",
+    "// console.log(1);\n",
+    "/* console.log(1); */\n",
+    "const re = /console.log\\(/;\n",
+    "a && console.log(x);\n",
+    "items.forEach((item) => console.log(item));\n",
+    "console.error('kept');\n",
+    "myconsole.log(1);\n",
+    # Boundary bytes that do not start a statement
+    "const t = `${a}${console.log(a)}`;\n",
+    "for (let i = 0; console.log(i); i++) {}\n",
+    # The call's value is still used after the closing parenthesis
+    "console.log(a).then(f);\n",
+    "console.log(a), b();\n",
+    "console.log(a) || x();\n",
+    "x();\nconsole.log(a)[0] = 1;\n",
+    "console.log(a)\n  .foo();\n",
+])
+def test_leaves_look_alikes_and_expressions(source):
+    assert strip(source) == (source, [])
+
+
+def test_jsx_attribute_expression_is_kept():
+    source = '<button onClick={console.log("x")}>\n'
+    assert strip(source) == (source, [])
+    stripped, _ = strip('<button onClick={() => { console.log("x"); }}>\n')
+    assert stripped == "<button onClick={() => {  }}>\n"
+
+
+def test_removes_statement_without_semicolon():
+    assert strip("{\n  console.log(a)\n  foo();\n}\n") == ("{\n  foo();\n}\n", [(2, 3, "console.log")])
+    assert strip("if (x) { console.log(a) }\n")[0] == "if (x) {  }\n"
+
+
+def test_removes_statement_inside_template_expression():
+    source = "const t = `a ${(() => { console.log(\"in\"); return 1; })()} b`;\n"
+    stripped, matches = strip(source)
+    assert stripped == "const t = `a ${(() => {  return 1; })()} b`;\n"
+    assert len(matches) == 1
+
+
+def test_nested_call_counts_once():
+    stripped, matches = strip("f();\nconsole.log(console.log(1), `)`);\n")
+    assert stripped == "f();\n"
+    assert len(matches) == 1
+
+
+def test_two_statements_on_one_line_drop_the_line():
+    stripped, matches = strip("{\n  console.log(a); console.log(b);\n}\n")
+    assert stripped == "{\n}\n"
+    assert [column for _, column, _ in matches] == [3, 19]
+
+
+def test_column_counts_code_points():
+    _, matches = strip('f("é"); console.log(1);\n')
+    assert matches == [(1, 9, "console.log")]
+
+
+def test_bytes_in_bytes_out():
+    assert strip(b"console.log(1);\nx();\n") == (b"x();\n", [(1, 1, "console.log")])
+
+
+def test_custom_targets():
+    source = "{\n  console.debug(1);\n  logger.warn(2);\n  console.log(3);\n}\n"
+    stripped, matches = strip(source, targets=["console.debug", "logger.*"])
+    assert stripped == "{\n  console.log(3);\n}\n"
+    assert [call for _, _, call in matches] == ["console.debug", "logger.warn"]
+
+
+@pytest.mark.parametrize("targets", [["a.*", "a.b.c"], ["a.b.c", "a.*"], ["a.*.c", "a.b", "a.d"]])
+def test_overlapping_targets(targets):
+    stripped, matches = strip("{\n  a.b.c(1);\n  a.d(2);\n}\n", targets=targets)
+    assert stripped == "{\n}\n"
+    assert len(matches) == 2
+
+
+def test_wildcard_keeps_chained_calls():
+    source = '{\n  logger.child.info("x");\n  logger.child({ a: 1 }).info("y");\n}\n'
+    stripped, _ = strip(source, targets=["logger.*", "logger.child.info"])
+    assert stripped == '{\n  logger.child({ a: 1 }).info("y");\n}\n'
+
+
+@pytest.mark.parametrize("mmap_threshold, needs_unmapped", [(1, False), (1, True), (1 << 30, False)])
+def test_file_rewrite_and_check(tmp_path, monkeypatch, mmap_threshold, needs_unmapped):
+    monkeypatch.setattr(clear_console_logs, "MMAP_THRESHOLD", mmap_threshold)
+    monkeypatch.setattr(clear_console_logs, "REPLACE_NEEDS_UNMAPPED", needs_unmapped)
+    path = tmp_path / "a.ts"
+    path.write_text("function f() {\n  console.log(1);\n  return 2;\n}\n")
+
+    locations, clean, _ = clear_console_logs.find_console_logs_in_file(str(path))
+    assert (locations, clean) == ([(2, 3, "console.log")], False)
+
+    removed, clean, _ = clear_console_logs.remove_console_logs_from_file(str(path))
+    assert (removed, clean) == (1, False)
+    assert path.read_text() == "function f() {\n  return 2;\n}\n"
+
+
+def test_rewrite_keeps_symlink(tmp_path):
+    target = tmp_path / "real.ts"
+    target.write_text("console.log(1);\nx();\n")
+    link = tmp_path / "link.ts"
+    os.symlink(target, link)
+
+    clear_console_logs.remove_console_logs_from_file(str(link))
+    assert link.is_symlink()
+    assert target.read_text() == "x();\n"
+
+
+class CountingBytes(bytes):
+    """bytes that count how many bytes Python code reads out of them.
+
+    The scanner's regex searches run in C and are linear; a quadratic scan
+    shows up as Python-level indexing or slicing, which this counts.
+    """
+
+    reads = 0
+
+    def __getitem__(self, index):
+        item = super().__getitem__(index)
+        self.reads += len(item) if isinstance(index, slice) else 1
+        return item
+
+
+def _scan_reads(data):
+    data = CountingBytes(data)
+    scanner = clear_console_logs.ConsoleLogScanner(data)
+    scanner.scan()
+    return data.reads, scanner
+
+
+def test_long_single_line_scans_in_linear_time():
+    # Many statements on one generated line used to make the scan quadratic.
+    unit = b"console.log(a);x();"
+    small, _ = _scan_reads(unit * 1000)
+    large, scanner = _scan_reads(unit * 4000)
+    assert len(scanner.matches) == 4000
+    assert scanner.spans == [(len(unit) * i, len(unit) * i + 15) for i in range(4000)]
+    assert large <= small * 4.5
+
+
+def test_long_single_line_locations_in_linear_time():
+    unit = b"console.log(a);x();"
+
+    def locate_reads(count):
+        _, scanner = _scan_reads(unit * count)
+        data = CountingBytes(unit * count)
+        locations = clear_console_logs.locate_matches(data, scanner.matches)
+        return data.reads, locations
+
+    small, _ = locate_reads(1000)
+    large, locations = locate_reads(4000)
+    assert locations[-1] == (1, len(unit) * 3999 + 1, "console.log")
+    assert large <= small * 4.5
+
+
+def test_missing_path_is_reported(tmp_path, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        clear_console_logs.main([str(tmp_path / "missing")])
+    assert excinfo.value.code == 2
+    assert "no such file or directory" in capsys.readouterr().err
+
+    with pytest.raises(FileNotFoundError):
+        clear_console_logs.strip_paths([str(tmp_path / "missing")])
+
+
+def _make_tree(root, files):
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def _walk(root, **options):
+    return sorted(os.path.relpath(path, root).replace(os.sep, "/")
+                  for path in clear_console_logs.find_source_files(str(root), **options))
+
+
+def test_gitignore_dir_only_and_anchored_patterns(tmp_path, monkeypatch):
+    _make_tree(tmp_path, {
+        ".gitignore": "cache.ts/\n/top.ts\ndocs/*.ts\n",
+        "cache.ts/a.ts": "",
+        "lib/cache.ts": "",
+        "top.ts": "",
+        "lib/top.ts": "",
+        "docs/a.ts": "",
+        "lib/docs/a.ts": "",
+    })
+    scanned = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: scanned.append(path) or scandir(path))
+
+    assert _walk(tmp_path) == ["lib/cache.ts", "lib/docs/a.ts", "lib/top.ts"]
+    # Ignored directories are pruned, not walked and filtered
+    assert os.path.join(str(tmp_path), "lib") in scanned
+    assert os.path.join(str(tmp_path), "cache.ts") not in scanned
+
+
+def test_gitignore_negation(tmp_path):
+    _make_tree(tmp_path, {
+        ".gitignore": "*.ts\n!keep.ts\nvendor/\n!vendor/keep.ts\n",
+        "a.ts": "",
+        "keep.ts": "",
+        "lib/keep.ts": "",
+        "vendor/keep.ts": "",
+    })
+    # As with git, a file cannot be re-included when its directory is ignored
+    assert _walk(tmp_path) == ["keep.ts", "lib/keep.ts"]
+
+
+def test_gitignore_double_star():
+    rules = clear_console_logs.IgnoreRules(["**/gen", "a/**/b.ts", "out/**"])
+    assert rules.match("x/y/gen", True)
+    assert rules.match("a/b.ts", False)
+    assert rules.match("a/x/y/b.ts", False)
+    assert rules.match("out/x/y.ts", False)
+    assert rules.match("x/a/b.ts", False) is None
+    assert rules.match("out", True) is None
+
+
+def test_nested_gitignore(tmp_path):
+    _make_tree(tmp_path, {
+        "lib/.gitignore": "local.ts\n/anchored.ts\n",
+        "local.ts": "",
+        "lib/local.ts": "",
+        "lib/sub/local.ts": "",
+        "lib/anchored.ts": "",
+        "lib/sub/anchored.ts": "",
+    })
+    assert _walk(tmp_path) == ["lib/sub/anchored.ts", "local.ts"]
+
+
+def test_parent_gitignore(tmp_path):
+    _make_tree(tmp_path, {
+        ".gitignore": "src/gen/\n/src/top.ts\n*.log.ts\n",
+        "src/gen/a.ts": "",
+        "src/top.ts": "",
+        "src/lib/top.ts": "",
+        "src/x.log.ts": "",
+    })
+    src = tmp_path / "src"
+    # Outside a repository the files above the walk root do not apply
+    assert clear_console_logs.parent_gitignore_rules(str(src)) == []
+
+    (tmp_path / ".git").mkdir()
+    rules = clear_console_logs.parent_gitignore_rules(str(src))
+    assert [rule_set.prepend for rule_set in rules] == ["src/"]
+    assert _walk(src) == ["lib/top.ts"]
+    assert _walk(src, use_gitignore=False) == ["gen/a.ts", "lib/top.ts", "top.ts", "x.log.ts"]
+
+
+def test_exclude_globs_and_default_test_skip(tmp_path):
+    _make_tree(tmp_path, {
+        "a.ts": "",
+        "a.d.ts": "",
+        "a.spec.ts": "",
+        "b.test.tsx": "",
+        "vendor/c.ts": "",
+    })
+    assert _walk(tmp_path) == ["a.d.ts", "a.ts", "vendor/c.ts"]
+    assert _walk(tmp_path, excludes=("vendor", "*.d.ts")) == ["a.spec.ts", "a.ts", "b.test.tsx"]
+    assert _walk(tmp_path, excludes=()) == ["a.d.ts", "a.spec.ts", "a.ts", "b.test.tsx", "vendor/c.ts"]
+
+
+def _check_paths(paths, **options):
+    file_count, processed = clear_console_logs.process_paths(
+        clear_console_logs.find_console_logs_in_file, paths, **options)
+    return file_count, sorted(os.path.basename(file_path) for file_path, _ in processed)
+
+
+@pytest.fixture
+def cached_tree(tmp_path):
+    _make_tree(tmp_path, {
+        "src/plain.ts": "x();\n",
+        "src/mention.ts": "// console.log(1)\n",
+        "src/dirty.ts": "console.log(1);\n",
+    })
+    return tmp_path / "src", str(tmp_path / "cache.json")
+
+
+def test_cache_skips_clean_files(cached_tree):
+    src, cache_path = cached_tree
+    assert _check_paths([str(src)], cache_path=cache_path) == (3, ["dirty.ts", "mention.ts", "plain.ts"])
+    # Files with findings are never cached
+    assert _check_paths([str(src)], cache_path=cache_path) == (3, ["dirty.ts"])
+
+
+def test_cache_rereads_changed_files(cached_tree, monkeypatch):
+    src, cache_path = cached_tree
+    _check_paths([str(src)], cache_path=cache_path)
+    (src / "plain.ts").write_text("x();\ny();\n")
+    stat = os.stat(src / "mention.ts")
+    os.utime(src / "mention.ts", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert _check_paths([str(src)], cache_path=cache_path) == (3, ["dirty.ts", "mention.ts", "plain.ts"])
+
+    # Only the mtime changed, so the stored hash still spares the scan
+    os.utime(src / "mention.ts", ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+    scanned = []
+    scanner = clear_console_logs.ConsoleLogScanner
+    monkeypatch.setattr(clear_console_logs, "ConsoleLogScanner",
+                        lambda data, matcher: scanned.append(bytes(data)) or scanner(data, matcher))
+    assert _check_paths([str(src)], cache_path=cache_path) == (3, ["dirty.ts", "mention.ts"])
+    assert scanned == [b"console.log(1);\n"]
+
+
+def test_cache_for_other_targets_is_ignored(cached_tree):
+    src, cache_path = cached_tree
+    _check_paths([str(src)], cache_path=cache_path)
+    assert _check_paths([str(src)], cache_path=cache_path, targets=["console.debug"]) == (
+        3, ["dirty.ts", "mention.ts", "plain.ts"])
+    assert clear_console_logs.load_cache(cache_path, clear_console_logs.DEFAULT_MATCHER) == {}
+
+
+def test_since_lists_changed_and_untracked_files(tmp_path, monkeypatch):
+    for name in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{name}_NAME", "test")
+        monkeypatch.setenv(f"GIT_{name}_EMAIL", "test@example.com")
+    monkeypatch.chdir(tmp_path)
+
+    def git(*args):
+        subprocess.run(["git", *args], check=True, capture_output=True)
+
+    _make_tree(tmp_path, {
+        ".gitignore": "ignored.ts\n",
+        "src/changed.ts": "x();\n",
+        "src/same.ts": "x();\n",
+        "src/deleted.ts": "x();\n",
+    })
+    git("init", "-q")
+    git("add", ".")
+    git("commit", "-q", "-m", "initial")
+    _make_tree(tmp_path, {
+        "src/changed.ts": "console.log(1);\n",
+        "src/untracked.ts": "",
+        "src/untracked.spec.ts": "",
+        "src/ignored.ts": "",
+    })
+    os.remove("src/deleted.ts")
+
+    changed = clear_console_logs.find_changed_source_files("src", "HEAD")
+    assert changed == [os.path.join("src", "changed.ts"), os.path.join("src", "untracked.ts")]
+    assert _check_paths(["src"], since="HEAD") == (2, ["changed.ts", "untracked.ts"])
+
+
+@pytest.fixture
+def check_tree(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _make_tree(tmp_path, {
+        "src/a.ts": "function f() {\n  console.log(1);\n}\n",
+        "src/b.ts": "x();\n",
+    })
+    return tmp_path
+
+
+def test_check_exit_code(check_tree, capsys):
+    assert clear_console_logs.main(["--check", "src"]) == 1
+    out, err = capsys.readouterr()
+    assert out == f"{os.path.join('src', 'a.ts')}:2:3: console.log\n"
+    assert "Checked 2 files: found 1 statement(s) in 1 file(s)" in err
+    assert (check_tree / "src/a.ts").read_text() == "function f() {\n  console.log(1);\n}\n"
+
+    assert clear_console_logs.main(["--check", "src/b.ts"]) == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_check_json_report(check_tree, capsys):
+    assert clear_console_logs.main(["--check", "--report", "json", "src"]) == 1
+    assert json.loads(capsys.readouterr().out) == [
+        {"file": "src/a.ts", "line": 2, "column": 3, "call": "console.log"},
+    ]
+
+
+def test_check_sarif_report(check_tree, capsys):
+    assert clear_console_logs.main(["--check", "--report", "sarif", "-o", "report.sarif", "src"]) == 1
+    assert capsys.readouterr().out == ""
+    report = json.loads((check_tree / "report.sarif").read_text())
+    assert report["version"] == "2.1.0"
+    run, = report["runs"]
+    assert run["tool"]["driver"]["rules"][0]["id"] == "logging-call"
+    result, = run["results"]
+    assert result["ruleId"] == "logging-call"
+    assert result["locations"][0]["physicalLocation"] == {
+        "artifactLocation": {"uri": "src/a.ts"},
+        "region": {"startLine": 2, "startColumn": 3},
+    }
+
+    assert clear_console_logs.main(["--check", "--report", "sarif", "src/b.ts"]) == 0
+    assert json.loads(capsys.readouterr().out)["runs"][0]["results"] == []